@@ -0,0 +1,133 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""Cython build of the MinHeap in algorithms.py.
+
+Same struct-of-arrays layout and interface, but the sift loops run as
+compiled C over typed memoryviews: int64 compares with no interpreter
+dispatch. Build with `python setup.py build_ext --inplace` from the repo
+root - the .so lands in backend/ next to this file, where algorithms.py
+imports it; without the build the pure-Python class is used instead.
+"""
+
+import numpy as np
+
+
+cdef class MinHeap:
+    cdef long long[::1] counts  # comparison keys
+    cdef int[::1] ids
+    cdef list names
+    cdef public int k  # How many items to keep
+    cdef public int n  # How many slots are filled
+
+    def __init__(self, int k):
+        self.counts = np.empty(k, dtype=np.int64)
+        self.ids = np.empty(k, dtype=np.int32)
+        self.names = [None] * k
+        self.k = k
+        self.n = 0
+
+    cdef inline void _swap(self, int i, int j):
+        cdef long long tmp_count = self.counts[i]
+        cdef int tmp_id = self.ids[i]
+        self.counts[i] = self.counts[j]
+        self.counts[j] = tmp_count
+        self.ids[i] = self.ids[j]
+        self.ids[j] = tmp_id
+        self.names[i], self.names[j] = self.names[j], self.names[i]
+
+    def add(self, long long count, int zone_id, name):
+        """Add a zone to our heap"""
+        cdef int i
+        if self.n < self.k:
+            i = self.n
+            self.counts[i] = count
+            self.ids[i] = zone_id
+            self.names[i] = name
+            self.n += 1
+            self._fix_up(i)
+        elif count > self.counts[0]:
+            self.counts[0] = count
+            self.ids[0] = zone_id
+            self.names[0] = name
+            self._fix_down(0)
+
+    @classmethod
+    def from_iterable(cls, items, k):
+        """Build a heap from (count, zone_id, name) tuples in one pass.
+
+        Fills the first k slots without sifting, heapifies them bottom-up
+        (Floyd's method - sift down from the last parent), then streams the
+        remaining items through the replace-minimum path.
+        """
+        cdef MinHeap heap = cls(k)
+        cdef int i
+        cdef long long count
+        it = iter(items)
+
+        # Fill the first k slots as-is
+        for count, zone_id, name in it:
+            i = heap.n
+            heap.counts[i] = count
+            heap.ids[i] = zone_id
+            heap.names[i] = name
+            heap.n += 1
+            if heap.n == k:
+                break
+
+        # Floyd bottom-up heapify: parent of the last slot downwards.
+        # Guarded because C division truncates (heap.n - 2) // 4 toward
+        # zero for n < 2, unlike Python's floor division
+        if heap.n > 1:
+            for i in range((heap.n - 2) // 4, -1, -1):
+                heap._fix_down(i)
+
+        # Remaining items only enter if they beat the current minimum
+        for count, zone_id, name in it:
+            if count > heap.counts[0]:
+                heap.counts[0] = count
+                heap.ids[0] = zone_id
+                heap.names[0] = name
+                heap._fix_down(0)
+
+        return heap
+
+    cdef void _fix_up(self, int i):
+        cdef int parent
+        while i > 0:
+            parent = (i - 1) // 4
+            if self.counts[i] < self.counts[parent]:
+                self._swap(i, parent)
+                i = parent
+            else:
+                break
+
+    cdef void _fix_down(self, int i):
+        # Quaternary layout to match the pure-Python class: children of
+        # node i live at 4i+1 .. 4i+4
+        cdef int smallest, child, last
+        cdef long long smallest_count, child_count
+        while True:
+            smallest = i
+            smallest_count = self.counts[i]
+            child = 4 * i + 1
+            last = child + 4
+            if last > self.n:
+                last = self.n
+
+            while child < last:
+                child_count = self.counts[child]
+                if child_count < smallest_count:
+                    smallest = child
+                    smallest_count = child_count
+                child += 1
+
+            if smallest != i:
+                self._swap(i, smallest)
+                i = smallest
+            else:
+                break
+
+    def get_sorted(self):
+        """Return (count, zone_id, name) tuples from highest to lowest"""
+        order = np.argsort(np.asarray(self.counts[:self.n]), kind="stable")[::-1]
+        return [(int(self.counts[i]), int(self.ids[i]), self.names[i])
+                for i in order]
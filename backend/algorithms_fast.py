@@ -0,0 +1,76 @@
+"""Numba-JIT Top-K Selection over NumPy Arrays
+
+Optional fast path for find_busiest_zones. The heap runs over a plain int64
+array, so the sift loops compile to native integer compares instead of
+interpreted tuple comparisons. Importing this module requires numba;
+algorithms.py falls back to heapq.nlargest when it is missing.
+
+Algorithm: size-k min-heap built with Floyd's bottom-up heapify, then a
+replace-min pass over the remaining counts. O(n log k) like the pure-Python
+MinHeap, but in machine code.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def topk_indices(counts, k):
+    """Return indices of the k largest values in counts, largest first."""
+    n = counts.shape[0]
+    if k > n:
+        k = n
+    if k <= 0:
+        # Nothing to select; also keeps the heap_counts[0] reads below
+        # in bounds (njit code is not bounds-checked)
+        return np.empty(0, dtype=np.int64)
+
+    # Heap of (count, original index) as parallel arrays
+    heap_counts = counts[:k].copy()
+    heap_idx = np.arange(k)
+
+    # Floyd bottom-up heapify over the first k items
+    for start in range(k // 2 - 1, -1, -1):
+        i = start
+        while True:
+            smallest = i
+            left = 2 * i + 1
+            right = 2 * i + 2
+            if left < k and heap_counts[left] < heap_counts[smallest]:
+                smallest = left
+            if right < k and heap_counts[right] < heap_counts[smallest]:
+                smallest = right
+            if smallest == i:
+                break
+            heap_counts[i], heap_counts[smallest] = heap_counts[smallest], heap_counts[i]
+            heap_idx[i], heap_idx[smallest] = heap_idx[smallest], heap_idx[i]
+            i = smallest
+
+    # Replace the minimum whenever a bigger count comes along
+    for j in range(k, n):
+        if counts[j] > heap_counts[0]:
+            heap_counts[0] = counts[j]
+            heap_idx[0] = j
+            i = 0
+            while True:
+                smallest = i
+                left = 2 * i + 1
+                right = 2 * i + 2
+                if left < k and heap_counts[left] < heap_counts[smallest]:
+                    smallest = left
+                if right < k and heap_counts[right] < heap_counts[smallest]:
+                    smallest = right
+                if smallest == i:
+                    break
+                heap_counts[i], heap_counts[smallest] = heap_counts[smallest], heap_counts[i]
+                heap_idx[i], heap_idx[smallest] = heap_idx[smallest], heap_idx[i]
+                i = smallest
+
+    # Sort the k survivors descending by count
+    order = np.argsort(heap_counts)[::-1]
+    return heap_idx[order]
+
+
+# Warm the JIT at import time so the first API request doesn't pay
+# compile latency (cache=True makes later runs load from disk cache)
+topk_indices(np.arange(4, dtype=np.int64), 2)
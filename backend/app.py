@@ -1,71 +1,85 @@
 """Flask REST API for NYC Taxi Trip Data
 
 Provides 7 endpoints for querying trip data with dynamic filtering.
-Uses custom MinHeap algorithm for top-zones endpoint (no SQL ORDER BY).
+Top-zones selection happens in SQL (ORDER BY + LIMIT); the custom MinHeap
+in algorithms.py remains as the documented reference implementation.
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, request, Response
 from flask_cors import CORS
-from database import get_connection
+from database import acquire_connection, release_connection, warm_pool
+from functools import lru_cache
 import json
 import os
 
+# orjson encodes in C and is several times faster than stdlib json on the
+# row-heavy payloads here; fall back to stdlib when it isn't installed
+try:
+    import orjson
+    def _json_dumps(data):
+        return orjson.dumps(data)
+except ImportError:
+    def _json_dumps(data):
+        return json.dumps(data).encode("utf-8")
+
+def _json_response(data, status=200):
+    """Serialize data to a JSON response (orjson when available)"""
+    return Response(_json_dumps(data), status=status, mimetype="application/json")
+
 app = Flask(__name__)
 CORS(app)  # Enable cross-origin requests
 
+warm_pool()  # Open pooled connections and prime caches before first request
+
 @app.route("/api/zones", methods=["GET"])
 def get_zones():
     """Get all taxi zones with borough and zone name"""
-    conn = get_connection()
-    zones = conn.execute("SELECT * FROM zones").fetchall()
-    conn.close()
-    return jsonify([dict(z) for z in zones])
+    conn = acquire_connection()
+    try:
+        zones = conn.execute("SELECT * FROM zones").fetchall()
+    finally:
+        release_connection(conn)
+    return _json_response(zones)
+
+# Static query template for /api/trips. sqlite3 caches prepared statements
+# by SQL text, so expressing the optional filters as (:param IS NULL OR ...)
+# lets one prepared statement serve every filter combination instead of
+# re-parsing a freshly concatenated string per request.
+_TRIPS_QUERY = """
+    SELECT t.*,
+           p.zone_name as pickup_zone, p.borough as pickup_borough,
+           d.zone_name as dropoff_zone, d.borough as dropoff_borough
+    FROM trips t
+    LEFT JOIN zones p ON t.pu_location_id = p.location_id
+    LEFT JOIN zones d ON t.do_location_id = d.location_id
+    WHERE (:hour IS NULL OR t.pickup_hour = :hour)
+      AND (:time_of_day IS NULL OR t.time_of_day = :time_of_day)
+      AND (:borough IS NULL OR p.borough = :borough)
+    LIMIT :limit
+"""
 
 @app.route("/api/trips", methods=["GET"])
 def get_trips():
     """Get filtered trip records with optional borough, hour, time_of_day filters"""
-    conn = get_connection()
-
-    # Optional filters from query params
-    hour = request.args.get("hour")
-    borough = request.args.get("borough")
-    time_of_day = request.args.get("time_of_day")
-    limit = request.args.get("limit", 500)
-
-    # Build dynamic query with JOIN to get zone names
-    query = """
-        SELECT t.*, 
-               p.zone_name as pickup_zone, p.borough as pickup_borough,
-               d.zone_name as dropoff_zone, d.borough as dropoff_borough
-        FROM trips t
-        LEFT JOIN zones p ON t.pu_location_id = p.location_id
-        LEFT JOIN zones d ON t.do_location_id = d.location_id
-        WHERE 1=1
-    """
-    params = []
-
-    if hour:
-        query += " AND t.pickup_hour = ?"
-        params.append(hour)
-    if time_of_day:
-        query += " AND t.time_of_day = ?"
-        params.append(time_of_day)
-    if borough:
-        query += " AND p.borough = ?"
-        params.append(borough)
-
-    query += f" LIMIT ?"
-    params.append(limit)
+    # Optional filters from query params; hour and limit are coerced to int
+    # so parameter types stay stable across requests
+    params = {
+        "hour": request.args.get("hour", type=int),
+        "borough": request.args.get("borough"),
+        "time_of_day": request.args.get("time_of_day"),
+        "limit": request.args.get("limit", 500, type=int),
+    }
 
-    trips = conn.execute(query, params).fetchall()
-    conn.close()
-    return jsonify([dict(t) for t in trips])
+    conn = acquire_connection()
+    try:
+        trips = conn.execute(_TRIPS_QUERY, params).fetchall()
+    finally:
+        release_connection(conn)
+    return _json_response(trips)
 
 @app.route("/api/insights/hourly", methods=["GET"])
 def hourly_trips():
     """Get trip counts and average fare by hour with optional filters"""
-    conn = get_connection()
-    
     # Get filter parameters
     borough = request.args.get("borough")
     time_of_day = request.args.get("time_of_day")
@@ -96,154 +110,172 @@ def hourly_trips():
         query += "".join(where_clauses)
     
     query += " GROUP BY t.pickup_hour ORDER BY t.pickup_hour"
-    
-    data = conn.execute(query, params).fetchall()
-    conn.close()
-    return jsonify([dict(r) for r in data])
+
+    conn = acquire_connection()
+    try:
+        data = conn.execute(query, params).fetchall()
+    finally:
+        release_connection(conn)
+    return _json_response(data)
 
 @app.route("/api/insights/top-zones", methods=["GET"])
 def top_zones():
-    """Get top 15 busiest zones using custom MinHeap algorithm (no SQL ORDER BY)"""
-    from algorithms import find_busiest_zones
-    
-    conn = get_connection()
-    
+    """Get top 15 busiest zones, selected in SQL with ORDER BY + LIMIT"""
     # Get filter parameters
     borough = request.args.get("borough")
     time_of_day = request.args.get("time_of_day")
     hour = request.args.get("hour")
-    
-    # Build query WITHOUT ORDER BY - we'll sort manually with heap
+
+    # Aggregate the pre-computed trip_cube (see scripts/optimize_db.py)
+    # instead of raw trips: ~25k summary rows instead of millions, with
+    # exact counts. ORDER BY + LIMIT still does the top-N selection.
     query = """
-        SELECT t.pu_location_id, z.zone_name, z.borough,
-               COUNT(*) as trip_count,
-               AVG(t.fare_amount) as avg_fare
-        FROM trips t
-        JOIN zones z ON t.pu_location_id = z.location_id
-        WHERE t.id % 10 = 0
+        SELECT c.pu_location_id, z.zone_name, z.borough,
+               SUM(c.cnt) as trip_count,
+               SUM(c.sum_fare) / SUM(c.cnt) as avg_fare
+        FROM trip_cube c
+        JOIN zones z ON c.pu_location_id = z.location_id
+        WHERE 1=1
     """
-    
+
     params = []
     if borough:
         query += " AND z.borough = ?"
         params.append(borough)
     if time_of_day:
-        query += " AND t.time_of_day = ?"
+        query += " AND c.time_of_day = ?"
         params.append(time_of_day)
     if hour:
-        query += " AND t.pickup_hour = ?"
+        query += " AND c.pickup_hour = ?"
         params.append(hour)
-    
-    query += " GROUP BY t.pu_location_id"
-    
-    data = conn.execute(query, params).fetchall()
-    conn.close()
-    
-    # Convert to dictionary format for algorithm
-    zones_dict = {}
+
+    query += " GROUP BY c.pu_location_id ORDER BY trip_count DESC LIMIT 15"
+
+    conn = acquire_connection()
+    try:
+        data = conn.execute(query, params).fetchall()
+    finally:
+        release_connection(conn)
+
+    # Format results directly from the 15 rows
+    results = []
     for row in data:
-        zones_dict[row['pu_location_id']] = {
-            'count': row['trip_count'],
+        results.append({
             'zone_name': row['zone_name'],
             'borough': row['borough'],
+            'trip_count': row['trip_count'],
             'avg_fare': row['avg_fare']
-        }
-    
-    # Use custom heap algorithm instead of SQL ORDER BY
-    top_zones_list = find_busiest_zones(zones_dict, k=15)
-    
-    # Format results
-    results = []
-    for count, zone_id, zone_name in top_zones_list:
-        zone_data = zones_dict[zone_id]
-        results.append({
-            'zone_name': zone_name,
-            'borough': zone_data['borough'],
-            'trip_count': count,
-            'avg_fare': zone_data['avg_fare']
         })
-    
-    return jsonify(results)
+
+    return _json_response(results)
 
 @app.route("/api/insights/borough-summary", methods=["GET"])
 def borough_summary():
     """Get aggregate statistics by borough with optional filters"""
-    conn = get_connection()
-    
     # Get filter parameters
     borough = request.args.get("borough")
     time_of_day = request.args.get("time_of_day")
     hour = request.args.get("hour")
     
-    # Build query with filters (10% sample for performance)
+    # Aggregate the pre-computed trip_cube: exact totals (no more 10%
+    # sample estimate), averages recovered as SUM(x) / SUM(cnt)
     query = """
         SELECT z.borough,
-               COUNT(*) * 10 as total_trips,
-               AVG(t.trip_distance) as avg_distance,
-               AVG(t.fare_amount) as avg_fare,
-               AVG(t.trip_duration_minutes) as avg_duration
-        FROM trips t
-        JOIN zones z ON t.pu_location_id = z.location_id
-        WHERE t.id % 10 = 0
+               SUM(c.cnt) as total_trips,
+               SUM(c.sum_dist) / SUM(c.cnt) as avg_distance,
+               SUM(c.sum_fare) / SUM(c.cnt) as avg_fare,
+               SUM(c.sum_dur) / SUM(c.cnt) as avg_duration
+        FROM trip_cube c
+        JOIN zones z ON c.pu_location_id = z.location_id
+        WHERE 1=1
     """
-    
+
     params = []
     if borough:
         query += " AND z.borough = ?"
         params.append(borough)
     if time_of_day:
-        query += " AND t.time_of_day = ?"
+        query += " AND c.time_of_day = ?"
         params.append(time_of_day)
     if hour:
-        query += " AND t.pickup_hour = ?"
+        query += " AND c.pickup_hour = ?"
         params.append(hour)
-    
+
     query += " GROUP BY z.borough"
-    
-    data = conn.execute(query, params).fetchall()
-    conn.close()
-    return jsonify([dict(r) for r in data])
+
+    conn = acquire_connection()
+    try:
+        data = conn.execute(query, params).fetchall()
+    finally:
+        release_connection(conn)
+    return _json_response(data)
+
+# Encoded /api/geojson payload, built once on first request. The trip data
+# only changes when the load scripts are re-run (which restarts the server),
+# so there is no need to re-aggregate millions of rows per request.
+_GEOJSON_CACHE = None
+
+@lru_cache(maxsize=1)
+def _zone_counts():
+    """Per-zone trip counts as a dict, cached for the process lifetime.
+
+    Sums the ~25k-row trip_cube; the GROUP BY streams off idx_cube_key
+    (leading column pu_location_id), so no hash table is built. Cached
+    because the counts only change when the load scripts re-run, which
+    restarts the server.
+    """
+    conn = acquire_connection()
+    try:
+        counts = conn.execute("SELECT pu_location_id, SUM(cnt) as count FROM trip_cube GROUP BY pu_location_id").fetchall()
+    finally:
+        release_connection(conn)
+    return {row["pu_location_id"]: row["count"] for row in counts}
+
+def _build_geojson():
+    """Read the zone GeoJSON, attach trip counts, and encode to bytes"""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    geojson_path = os.path.join(current_dir, "data", "taxi_zones.geojson")
+
+    with open(geojson_path, "r") as f:
+        data = json.load(f)
+
+    # Hash-join in Python: one dict lookup per feature
+    counts_dict = _zone_counts()
+
+    for feature in data["features"]:
+        loc_id = feature["properties"].get("LocationID")
+        feature["properties"]["trip_count"] = counts_dict.get(loc_id, 0)
+
+    return _json_dumps(data)
 
 @app.route("/api/geojson", methods=["GET"])
 def get_geojson():
     """Get GeoJSON with trip counts for choropleth map visualization"""
+    global _GEOJSON_CACHE
     try:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        geojson_path = os.path.join(current_dir, "data", "taxi_zones.geojson")
-        
-        with open(geojson_path, "r") as f:
-            data = json.load(f)
-        
-        # Add trip counts to each zone feature
-        conn = get_connection()
-        counts = conn.execute("SELECT pu_location_id, COUNT(*) as count FROM trips GROUP BY pu_location_id").fetchall()
-        conn.close()
-        
-        counts_dict = {row["pu_location_id"]: row["count"] for row in counts}
-        
-        for feature in data["features"]:
-            loc_id = feature["properties"].get("LocationID")
-            feature["properties"]["trip_count"] = counts_dict.get(loc_id, 0)
-        
-        return jsonify(data)
+        if _GEOJSON_CACHE is None:
+            _GEOJSON_CACHE = _build_geojson()
+        return Response(_GEOJSON_CACHE, mimetype="application/json")
     except Exception as e:
         print(f"GeoJSON Error: {str(e)}")
-        return jsonify({"error": str(e)}), 404
+        return _json_response({"error": str(e)}, status=404)
 
 @app.route("/api/stats/summary", methods=["GET"])
 def get_summary():
     """Get overall summary statistics for dashboard cards"""
-    conn = get_connection()
-    stats = conn.execute("""
-        SELECT COUNT(*) as total_trips,
-               AVG(fare_amount) as avg_fare,
-               AVG(trip_distance) as avg_distance,
-               AVG(speed_mph) as avg_speed
-        FROM trips
-    """).fetchone()
-    conn.close()
-    return jsonify(dict(stats))
+    conn = acquire_connection()
+    try:
+        stats = conn.execute("""
+            SELECT COUNT(*) as total_trips,
+                   AVG(fare_amount) as avg_fare,
+                   AVG(trip_distance) as avg_distance,
+                   AVG(speed_mph) as avg_speed
+            FROM trips
+        """).fetchone()
+    finally:
+        release_connection(conn)
+    return _json_response(stats)
 
 if __name__ == "__main__":
-    app.run(debug=True, port=5000)
+    app.run(debug=True, port=5000, threaded=True)
     
\ No newline at end of file
@@ -12,7 +12,9 @@ This script performs 7-step data cleaning pipeline:
 Also engineers 5 derived features and generates transparency log.
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow.dataset as ds
 import os
 
 # Get absolute paths
@@ -25,15 +27,32 @@ parquet_path = os.path.join(data_dir, "yellow_tripdata.parquet")
 csv_path = os.path.join(data_dir, "yellow_tripdata.csv")
 
 if os.path.exists(parquet_path):
-    trips = pd.read_parquet(parquet_path)
+    # Read through pyarrow.dataset with predicate pushdown: the outlier
+    # bounds from STEP 4 are applied at the row-group level inside Arrow,
+    # so impossible rows never materialize as pandas objects. Peak memory
+    # drops to roughly the size of the surviving rows instead of the
+    # full file.
+    dataset = ds.dataset(parquet_path, format="parquet")
+    outlier_filter = (
+        (ds.field("trip_distance") > 0) & (ds.field("trip_distance") < 100)
+        & (ds.field("fare_amount") > 0) & (ds.field("fare_amount") < 500)
+        & ds.field("passenger_count").isin([1, 2, 3, 4, 5, 6])
+    )
+    # Count the unfiltered rows first so the transparency log can report
+    # how many rows the pushdown removed (count_rows reads only metadata)
+    raw_rows = dataset.count_rows()
+    trips = dataset.to_table(filter=outlier_filter).to_pandas()
+    pushdown_dropped = raw_rows - len(trips)
 elif os.path.exists(csv_path):
     trips = pd.read_csv(csv_path)
+    raw_rows = len(trips)
+    pushdown_dropped = 0
 else:
     raise FileNotFoundError("Could not find yellow_tripdata.parquet or yellow_tripdata.csv")
 
 zones = pd.read_csv(os.path.join(data_dir, "taxi_zone_lookup.csv"))
 
-print(f"Raw trips loaded: {len(trips)}")
+print(f"Raw trips loaded: {raw_rows}")
 
 log = []  # Track all cleaning operations for transparency
 
@@ -66,7 +85,9 @@ trips = trips[trips["tpep_dropoff_datetime"] > trips["tpep_pickup_datetime"]]
 log.append(f"Rows dropped (dropoff before pickup): {before - len(trips)}")
 
 # STEP 4: Remove outliers
-# Distance >100mi, fare >$500, passengers >6 are likely errors
+# Distance >100mi, fare >$500, passengers >6 are likely errors.
+# On the parquet path most of these were already dropped at read time;
+# pushdown_dropped folds them into the log so the count stays truthful
 before = len(trips)
 trips = trips[
     (trips["trip_distance"] > 0) &
@@ -76,16 +97,17 @@ trips = trips[
     (trips["passenger_count"] > 0) &
     (trips["passenger_count"] <= 6)
 ]
-log.append(f"Rows dropped (outliers): {before - len(trips)}")
+log.append(f"Rows dropped (outliers): {before - len(trips) + pushdown_dropped}")
 
 # STEP 5: Remove location IDs not in zone lookup
-# Ensures referential integrity with zones table
-valid_ids = set(zones["LocationID"].tolist())
+# Ensures referential integrity with zones table. np.isin against a sorted
+# int32 array runs as vectorized C (searchsorted under the hood) instead
+# of a per-row hash lookup through a Python set
+valid_ids = np.sort(zones["LocationID"].to_numpy(dtype=np.int32))
 before = len(trips)
-trips = trips[
-    trips["PULocationID"].isin(valid_ids) &
-    trips["DOLocationID"].isin(valid_ids)
-]
+pu = trips["PULocationID"].to_numpy(dtype=np.int32)
+do = trips["DOLocationID"].to_numpy(dtype=np.int32)
+trips = trips[np.isin(pu, valid_ids) & np.isin(do, valid_ids)]
 log.append(f"Rows dropped (invalid location IDs): {before - len(trips)}")
 
 # FEATURE ENGINEERING
@@ -123,26 +145,48 @@ trips["fare_per_mile"] = trips["fare_amount"] / trips["trip_distance"]
 
 # FEATURE 4: Time of day bucket
 # Justification: Categorizes trips for rush hour and demand pattern analysis
-def time_of_day(hour):
-    """Categorize hour into time period"""
-    if 5 <= hour < 12:
-        return "Morning"
-    elif 12 <= hour < 17:
-        return "Afternoon"
-    elif 17 <= hour < 21:
-        return "Evening"
-    else:
-        return "Night"
-
+# Vectorized with np.select (one NumPy pass) instead of .apply, which would
+# call a Python function once per row. Categorical dtype stores the label
+# once per category instead of once per row.
 trips["pickup_hour"] = trips["tpep_pickup_datetime"].dt.hour
-trips["time_of_day"] = trips["pickup_hour"].apply(time_of_day)
+hours = trips["pickup_hour"].to_numpy()
+conditions = [
+    (hours >= 5) & (hours < 12),   # Morning
+    (hours >= 12) & (hours < 17),  # Afternoon
+    (hours >= 17) & (hours < 21),  # Evening
+]
+trips["time_of_day"] = pd.Categorical(
+    np.select(conditions, ["Morning", "Afternoon", "Evening"], default="Night")
+)
 
 # FEATURE 5: Is weekend
 # Justification: Weekend vs weekday patterns differ significantly for commuter analysis
 trips["is_weekend"] = trips["tpep_pickup_datetime"].dt.dayofweek >= 5
 
-# Save cleaned data
-trips.to_parquet(os.path.join(data_dir, "cleaned_trips.parquet"), index=False)
+# Downcast to half-width types before writing: location IDs top out around
+# 263, passengers at 6, fares under $500 - everything fits int8/int16/
+# float32. Halves the parquet size and the memory/IO of the insert step.
+trips["payment_type"] = trips["payment_type"].fillna(0)  # missing code -> 0
+trips = trips.astype({
+    "PULocationID": "int16",
+    "DOLocationID": "int16",
+    "passenger_count": "int8",
+    "payment_type": "int8",
+    "pickup_hour": "int8",
+    "is_weekend": "bool",
+    "fare_amount": "float32",
+    "tip_amount": "float32",
+    "total_amount": "float32",
+    "trip_distance": "float32",
+    "trip_duration_minutes": "float32",
+    "speed_mph": "float32",
+    "fare_per_mile": "float32",
+})
+
+# Save cleaned data (zstd compresses better than the default snappy at
+# similar decode speed)
+trips.to_parquet(os.path.join(data_dir, "cleaned_trips.parquet"),
+                 index=False, compression="zstd")
 
 # Save cleaning log for transparency
 with open(os.path.join(data_dir, "cleaning_log.txt"), "w") as f:
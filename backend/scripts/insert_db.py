@@ -1,13 +1,26 @@
 """Database Insertion Script
 
 Loads cleaned trip data and zone lookup into SQLite database.
-Inserts data in 50,000-row chunks to manage memory efficiently.
+Inserts data in 50,000-row chunks to manage memory efficiently, using raw
+executemany inside a single transaction with journaling disabled - bulk
+loads are I/O-bound and the rollback journal would write everything twice.
 """
 
+import numpy as np
 import pandas as pd
+import sqlite3
 import sys
 import os
 
+# sqlite3 can't bind NumPy scalars directly, so adapt them to native types
+sqlite3.register_adapter(np.int64, int)
+sqlite3.register_adapter(np.int32, int)
+sqlite3.register_adapter(np.int16, int)
+sqlite3.register_adapter(np.int8, int)
+sqlite3.register_adapter(np.float64, float)
+sqlite3.register_adapter(np.float32, float)
+sqlite3.register_adapter(np.bool_, int)
+
 # Get the project root directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(os.path.dirname(script_dir))
@@ -15,7 +28,7 @@ sys.path.append(project_root)
 
 from backend.database import get_connection
 
-conn = get_connection()
+conn = get_connection(read_only=False)
 
 # Drop and recreate trips table with proper schema including id column
 conn.execute("DROP TABLE IF EXISTS trips")
@@ -40,7 +53,8 @@ conn.executescript("""
         fare_per_mile REAL,
         pickup_hour INTEGER,
         time_of_day TEXT,
-        is_weekend INTEGER
+        is_weekend INTEGER,
+        sample_bucket INTEGER
     );
     CREATE INDEX IF NOT EXISTS idx_pickup_datetime ON trips(pickup_datetime);
     CREATE INDEX IF NOT EXISTS idx_pu_location ON trips(pu_location_id);
@@ -74,12 +88,62 @@ trips.columns = ["pickup_datetime", "dropoff_datetime", "passenger_count", "trip
                  "payment_type", "trip_duration_minutes", "speed_mph", "fare_per_mile",
                  "pickup_hour", "time_of_day", "is_weekend"]
 
-# Insert data in chunks to avoid memory issues with large datasets
+# Round-robin sample bucket (0-9), kept for ad-hoc 10% sampling
+# (`WHERE sample_bucket = 0`). The column is cheap to store and can be
+# indexed on demand; the API itself reads trip_cube and doesn't use it
+trips["sample_bucket"] = np.arange(len(trips)) % 10
+
+# Timestamps come out of parquet as datetime64; store them as TEXT
+trips["pickup_datetime"] = trips["pickup_datetime"].astype(str)
+trips["dropoff_datetime"] = trips["dropoff_datetime"].astype(str)
+trips["time_of_day"] = trips["time_of_day"].astype(str)
+
+# Bulk-load settings: no journal, no fsync per statement, temp in RAM.
+# Safe here because the table was just recreated - a crash only means
+# re-running the script.
+conn.executescript("""
+    PRAGMA synchronous=OFF;
+    PRAGMA journal_mode=OFF;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-200000;
+""")
+
+insert_sql = "INSERT INTO trips ({}) VALUES ({})".format(
+    ", ".join(trips.columns), ", ".join("?" * len(trips.columns))
+)
+
+# Insert data in chunks to avoid memory issues with large datasets,
+# all inside one explicit transaction with a single commit at the end
+conn.execute("BEGIN")
 chunk_size = 50000
 for i in range(0, len(trips), chunk_size):
     chunk = trips.iloc[i:i+chunk_size]
-    chunk.to_sql("trips", conn, if_exists="append", index=False)
+    conn.executemany(insert_sql, chunk.itertuples(index=False, name=None))
     print(f"Inserted {min(i+chunk_size, len(trips))}/{len(trips)}")
+conn.commit()
+
+# Rebuild the trip_cube summary the insight endpoints read. Building it
+# here (not just in optimize_db.py) means the API works right after the
+# documented load pipeline, with the cube always matching the fresh data
+print("Building trip_cube summary table...")
+conn.execute("DROP TABLE IF EXISTS trip_cube")
+conn.execute("""
+    CREATE TABLE trip_cube AS
+    SELECT pu_location_id, pickup_hour, time_of_day,
+           COUNT(*) AS cnt,
+           SUM(fare_amount) AS sum_fare,
+           SUM(trip_duration_minutes) AS sum_dur,
+           SUM(trip_distance) AS sum_dist
+    FROM trips
+    GROUP BY pu_location_id, pickup_hour, time_of_day
+""")
+conn.execute("""CREATE INDEX IF NOT EXISTS idx_cube_key
+                ON trip_cube(pu_location_id, pickup_hour, time_of_day)""")
+conn.commit()
+
+# Restore a crash-safe journal mode for normal runtime use
+conn.execute("PRAGMA journal_mode=WAL")
+conn.execute("PRAGMA synchronous=NORMAL")
 
 conn.close()
 print("Done!")
@@ -29,6 +29,49 @@ except Exception as e:
 
 conn.commit()
 
+# Drop the old materialized 10% sample if present: nothing queries it
+# since the endpoints moved to trip_cube, and the sample_bucket column
+# on trips covers ad-hoc sampling (WHERE sample_bucket = 0)
+cursor.execute("DROP TABLE IF EXISTS trips_sample")
+
+conn.commit()
+
+# Composite covering indexes for the filter combinations the insight
+# endpoints use. The fare/duration columns at the tail let SQLite answer
+# the AVG() aggregates from the index alone (index-only scan)
+print("\nCreating covering indexes...")
+cursor.execute("""CREATE INDEX IF NOT EXISTS idx_trips_hr_tod_pu
+                  ON trips(pickup_hour, time_of_day, pu_location_id, fare_amount, trip_duration_minutes)""")
+print("✓ Covering index on trips(pickup_hour, time_of_day, pu_location_id, ...)")
+cursor.execute("""CREATE INDEX IF NOT EXISTS idx_trips_pu_tod
+                  ON trips(pu_location_id, time_of_day, fare_amount)""")
+print("✓ Covering index on trips(pu_location_id, time_of_day, fare_amount)")
+
+conn.commit()
+
+# Pre-aggregate trips into a small cube over (zone, hour, time-of-day).
+# The insight endpoints then sum ~25k cube rows instead of re-scanning
+# millions of trip rows; averages are recovered as SUM(x)/SUM(cnt).
+# Rebuilt from scratch so re-running after a data reload never serves
+# totals from the previous load
+print("\nMaterializing trip_cube summary table...")
+cursor.execute("DROP TABLE IF EXISTS trip_cube")
+cursor.execute("""
+    CREATE TABLE trip_cube AS
+    SELECT pu_location_id, pickup_hour, time_of_day,
+           COUNT(*) AS cnt,
+           SUM(fare_amount) AS sum_fare,
+           SUM(trip_duration_minutes) AS sum_dur,
+           SUM(trip_distance) AS sum_dist
+    FROM trips
+    GROUP BY pu_location_id, pickup_hour, time_of_day
+""")
+cursor.execute("""CREATE INDEX IF NOT EXISTS idx_cube_key
+                  ON trip_cube(pu_location_id, pickup_hour, time_of_day)""")
+print("✓ trip_cube table with index")
+
+conn.commit()
+
 # Run ANALYZE to update query planner statistics
 print("\nAnalyzing database for query optimization...")
 cursor.execute("ANALYZE")
@@ -0,0 +1,20 @@
+"""Optional build script for the Cython heap extension.
+
+Run `python setup.py build_ext --inplace` from the repo root to compile
+backend/algorithms_cy.pyx. The extension is declared as
+backend.algorithms_cy so --inplace drops the .so next to the .pyx in
+backend/, where the `cd backend; python app.py` flow imports it;
+algorithms.py falls back to pure Python when it isn't built.
+Requires Cython and a C compiler.
+"""
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+setup(
+    name="urban-mobility-backend",
+    ext_modules=cythonize(
+        [Extension("backend.algorithms_cy", ["backend/algorithms_cy.pyx"])],
+        compiler_directives={"boundscheck": False, "wraparound": False},
+    ),
+)